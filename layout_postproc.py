@@ -2,22 +2,82 @@
 
 import sys
 import argparse
+import io
+import math
 import os
-import xml.etree.ElementTree as ET
+import re
+from collections import deque
+import numpy as np
+from lxml import etree as ET
+from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
+from reportlab.pdfgen.canvas import FILL_EVEN_ODD, FILL_NON_ZERO
 from reportlab.graphics import renderPDF
 from reportlab.lib.pagesizes import A4
-from svg.path import parse_path, Line, Move, Close, CubicBezier, Arc
+from svg.path import parse_path, Line, Move, Close, CubicBezier, QuadraticBezier, Arc
 from svglib.svglib import svg2rlg
 
+# Numba is strictly optional, everything works without it - just slower
+try:
+  from numba import njit
+except ImportError:
+  njit = None
+
 # FIXME: Further investivate the issue where the svg gets drawn in a slightly "pushed down" manner if it's height increases
 
 # ////////////////////////// Configuration //////////////////////////
 
-strip_tags = ['text'] # Text is sometimes visible outside of bounds, strip
-ignore_tags = ['title', 'desc'] # Title and desc are meta-info,
-temp_folder = '/tmp' # Path for temporary file storage
+strip_tags = frozenset(('text',)) # Text is sometimes visible outside of bounds, strip
+ignore_tags = frozenset(('title', 'desc')) # Title and desc are meta-info,
+
+# Styling properties the direct PDF renderer understands; anything else
+# on a drawable element makes the run fall back to the svglib pipeline
+supported_styles = frozenset((
+  'stroke', 'fill', 'stroke-width', 'stroke-linecap', 'stroke-linejoin',
+  'stroke-miterlimit', 'fill-rule', 'opacity', 'stroke-opacity', 'fill-opacity'
+))
+
+# Styling attributes which are known to alter the rendered appearance
+# in ways the direct renderer cannot reproduce
+unsupported_styles = frozenset((
+  'stroke-dasharray', 'stroke-dashoffset', 'clip-path', 'mask', 'filter',
+  'marker-start', 'marker-mid', 'marker-end', 'visibility', 'display',
+  'transform'
+))
+
+# Mappings from the SVG cap/join/fill keywords to the PDF operator values
+line_caps = { 'butt': 0, 'round': 1, 'square': 2 }
+line_joins = { 'miter': 0, 'round': 1, 'bevel': 2 }
+fill_modes = { 'nonzero': FILL_NON_ZERO, 'evenodd': FILL_EVEN_ODD }
+
+# Matches either a single path command letter or one numeric parameter
+path_token = re.compile(r'[A-Za-z]|[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?')
+
+# Parameters per repetition of each supported path command
+command_arity = { 'M': 2, 'L': 2, 'C': 6, 'A': 7, 'Z': 0 }
+
+# Any character outside this set means a description uses features the
+# fast tokenizer does not understand and has to take the generic route
+slow_path_chars = re.compile(r'[^MmLlCcAaZz0-9eE.,+\-\s]')
+
+# Serialization metadata collected during the tree walk, one entry per
+# drawable element in document order so that direct rendering preserves
+# the SVG's painting order; path entries read ('path', element,
+# first_pair, last_pair, commands) with pair indices referencing rows of
+# the shared coordinate store below, circle entries read
+# ('circle', element, pair_index) into the circle center store
+draw_cache: list[tuple] = []
+
+# Flat (x, y, x, y, ...) stores holding every path command coordinate
+# and every circle center of the whole document in one contiguous block
+# each, so that bounds and translation run as single array operations
+path_points: list[float] = []
+circle_points: list[float] = []
+
+# Additional points which only take part in the bounds reduction but
+# are never drawn directly, like the axis extremes of arc sweeps
+bounds_points: list[float] = []
 
 # //////////////////////////// Utilities ////////////////////////////
 
@@ -25,35 +85,119 @@ def normalize_tag(tagstr):
   '''
   Normalizes a tag string by splitting off it's namespace
   '''
-  return tagstr[tagstr.rindex('}') + 1:]
+  # rpartition runs single-pass in C and hands back the original
+  # string unchanged whenever there's no namespace brace at all
+  return tagstr.rpartition('}')[2]
+
+def bounds_kernel(points: np.ndarray) -> np.ndarray:
+  '''
+  Reduces an (N, 2) array of points into (MinX, MinY, MaxX, MaxY)
+  '''
+  return np.array([
+    points[:, 0].min(), points[:, 1].min(),
+    points[:, 0].max(), points[:, 1].max()
+  ])
+
+# Compile the innermost reduction into a typed native loop if possible
+if njit is not None:
+  bounds_kernel = njit(cache=True, fastmath=True)(bounds_kernel)
 
-def merge_bounds(dest: list[float], src: list[float]):
+def make_bounds() -> np.ndarray:
+  '''
+  Creates a fresh bound keeping array (MinX, MinY, MaxX, MaxY) with
+  infinity sentinels, so that any real coordinate takes precedence
+  '''
+  return np.array([np.inf, np.inf, -np.inf, -np.inf])
+
+def merge_bounds(dest: np.ndarray, src: np.ndarray):
   '''
   Merges two bound keeping arrays by integrating the new information of
   the source into the destination
   '''
-  if src[0] is not None and (dest[0] is None or src[0] < dest[0]):
-    dest[0] = src[0]
-  if src[0] is not None and (dest[1] is None or src[1] < dest[1]):
-    dest[1] = src[1]
-  if src[0] is not None and (dest[2] is None or src[2] > dest[2]):
-    dest[2] = src[2]
-  if src[0] is not None and (dest[3] is None or src[3] > dest[3]):
-    dest[3] = src[3]
-
-def update_bounds(dest: list[float], point: complex):
-  '''
-  Updates a bound keeping array by integrating the new
-  information of a given point
-  '''
-  if dest[0] is None or point.real < dest[0]:
-    dest[0] = point.real
-  if dest[1] is None or point.imag < dest[1]:
-    dest[1] = point.imag
-  if dest[2] is None or point.real > dest[2]:
-    dest[2] = point.real
-  if dest[3] is None or point.imag > dest[3]:
-    dest[3] = point.imag
+  np.minimum(dest[:2], src[:2], out=dest[:2])
+  np.maximum(dest[2:], src[2:], out=dest[2:])
+
+def parameterize_arc(
+  x1: float, y1: float, rx: float, ry: float, rotation: float,
+  large_arc: bool, sweep: bool, x2: float, y2: float
+) -> tuple:
+  '''
+  Converts an arc from SVG's endpoint notation into it's center
+  parametrization following the spec's implementation notes (F.6.5),
+  scaling up radii too small to span the endpoints; the center is kept
+  relative to the endpoint, which makes the result translation-proof
+  '''
+  rx = abs(rx)
+  ry = abs(ry)
+
+  phi = math.radians(rotation % 360)
+  cos_phi = math.cos(phi)
+  sin_phi = math.sin(phi)
+
+  # Half the endpoint difference, rotated into the ellipse frame
+  dx = (x1 - x2) / 2
+  dy = (y1 - y2) / 2
+  x1p = cos_phi * dx + sin_phi * dy
+  y1p = -sin_phi * dx + cos_phi * dy
+
+  # Scale up radii which cannot span the two endpoints
+  lam = (x1p / rx) ** 2 + (y1p / ry) ** 2
+  if lam > 1:
+    scale = math.sqrt(lam)
+    rx *= scale
+    ry *= scale
+
+  # Solve for the center in the rotated frame
+  numerator = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+  denominator = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+  factor = math.sqrt(max(numerator / denominator, 0)) if denominator != 0 else 0
+
+  if large_arc == sweep:
+    factor = -factor
+
+  cxp = factor * rx * y1p / ry
+  cyp = -factor * ry * x1p / rx
+
+  # Back into the user frame
+  cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+  cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+  # Start- and sweep angle in degrees
+  theta = math.degrees(math.atan2((y1p - cyp) / ry, (x1p - cxp) / rx))
+  theta_end = math.degrees(math.atan2((-y1p - cyp) / ry, (-x1p - cxp) / rx))
+
+  delta = (theta_end - theta) % 360
+  if not sweep and delta > 0:
+    delta -= 360
+
+  return (rx, ry, rotation, int(large_arc), int(sweep), theta, delta, cx - x2, cy - y2)
+
+def collect_arc_extremes(cx: float, cy: float, extra: tuple):
+  '''
+  Pushes the axis extremes an arc sweep passes through into the
+  bounds-only point store, so that a bulge beyond the two endpoints
+  still widens the computed bounds
+  '''
+  rx, ry, rotation, _, _, theta, delta = extra[:7]
+
+  # For a rotated ellipse the true extremes sit at awkward angles, so
+  # settle for the full ellipse box as a conservative answer
+  if rotation % 360 != 0:
+    bounds_points.extend((cx - rx, cy - ry, cx + rx, cy + ry))
+    return
+
+  for angle, x, y in (
+    (0, cx + rx, cy), (90, cx, cy + ry),
+    (180, cx - rx, cy), (270, cx, cy - ry)
+  ):
+    # Check whether the extreme's angle lies within the swept range
+    if delta >= 0:
+      covered = (angle - theta) % 360 <= delta
+    else:
+      covered = (theta - angle) % 360 <= -delta
+
+    if covered:
+      bounds_points.extend((x, y))
 
 def resolve_dimensions(root: ET.Element) -> tuple[float, float] | None:
   '''
@@ -70,7 +214,7 @@ def resolve_dimensions(root: ET.Element) -> tuple[float, float] | None:
   if width.endswith('cm') and height.endswith('cm'):
     return (float(width[:width.index('c')]) * 10, float(height[:height.index('c')]) * 10)
 
-def analyze_scaling(root: ET.Element) -> tuple[float, float, float]:
+def analyze_scaling(root: ET.Element) -> float:
   '''
   Analyzes the SVG's scaling by reading it's width and height
   as millimeters and calculating how many millimeters there
@@ -94,15 +238,7 @@ def analyze_scaling(root: ET.Element) -> tuple[float, float, float]:
     print('Unequal X/Y scaling is not supported')
     sys.exit(1)
 
-  return (width, height, result)
-
-def manip_start_end(command, x_off: float, y_off: float):
-  '''
-  Manipulates both the start- and the endpoint of a given command
-  by offsetting them on both axies
-  '''
-  command.start = complex(command.start.real + x_off, command.start.imag + y_off)
-  command.end = complex(command.end.real + x_off, command.end.imag + y_off)
+  return result
 
 def decide_svg_xy(width: int, height: int, padding: int, position: str) -> tuple[int, int]:
   '''
@@ -110,126 +246,562 @@ def decide_svg_xy(width: int, height: int, padding: int, position: str) -> tuple
   where the svg's top left position should be rendered at, based
   on it's width, height, page-padding and position choice
   '''
-  if position == 'TL':
-    return (padding * mm, padding * mm)
+  # All nine positions are just combinations of three X- and three Y-
+  # candidates, so compute each candidate once and look the answer up
+  xs = {
+    'L': padding * mm,
+    'C': A4[0] / 2 - width * mm / 2,
+    'R': A4[0] - width * mm - padding * mm
+  }
+
+  ys = {
+    'T': padding * mm,
+    'C': A4[1] / 2 - height * mm / 2,
+    'B': A4[1] - height * mm - padding * mm
+  }
+
+  return (xs[position[1]], ys[position[0]])
 
-  if position == 'TC':
-    return (A4[0] / 2 - width * mm / 2, padding * mm)
+# ///////////////////////// Element Handlers /////////////////////////
 
-  if position == 'TR':
-    return (A4[0] - width * mm - padding * mm, padding * mm)
+def handle_path_generic(element: ET.Element, d: str):
+  '''
+  Structure-agnostic counterpart to the fast tokenizer in handle_path,
+  pulling in svg.path to normalize exotic commands (H/V/S/Q/T and
+  relative forms alike) into the supported absolute subset before
+  feeding the very same stores - slower, but keeps unusual exports
+  working instead of bailing out
+  '''
+  first_pair = len(path_points) // 2
+  commands = []
+
+  push_points = path_points.extend
+  push_command = commands.append
+
+  for command in parse_path(d):
+    command_type = type(command)
+    end = command.end
+
+    if command_type is Move:
+      push_command(('M', None))
+      push_points((end.real, end.imag))
+
+    elif command_type is Line:
+      push_command(('L', None))
+      push_points((end.real, end.imag))
+
+    elif command_type is Close:
+      push_command(('Z', None))
+
+    elif command_type is CubicBezier:
+      control1 = command.control1
+      control2 = command.control2
+      push_command(('C', None))
+      push_points((
+        control1.real, control1.imag,
+        control2.real, control2.imag,
+        end.real, end.imag
+      ))
+
+    elif command_type is QuadraticBezier:
+      # Elevate the quadratic onto an equivalent cubic
+      start = command.start
+      control = command.control
+      control1 = start + (control - start) * (2 / 3)
+      control2 = end + (control - end) * (2 / 3)
+      push_command(('C', None))
+      push_points((
+        control1.real, control1.imag,
+        control2.real, control2.imag,
+        end.real, end.imag
+      ))
+
+    elif command_type is Arc:
+      # Degenerate arcs draw as straight lines (spec F.6.6) and carry
+      # no center parameterization
+      if command.start == end or command.radius.real == 0 or command.radius.imag == 0:
+        push_command(('L', None))
+        push_points((end.real, end.imag))
+        continue
+
+      center = command.center
+      extra = (
+        command.radius.real * command.radius_scale,
+        command.radius.imag * command.radius_scale,
+        command.rotation, int(command.arc), int(command.sweep),
+        command.theta, command.delta,
+        center.real - end.real, center.imag - end.imag
+      )
+      collect_arc_extremes(center.real, center.imag, extra)
+      push_command(('A', extra))
+      push_points((end.real, end.imag))
 
-  if position == 'CL':
-    return (padding * mm, A4[1] / 2 - height * mm / 2)
+    else:
+      print(f'Encountered unsupported path command {command_type}')
+      sys.exit(1)
 
-  if position == 'CC':
-    return (A4[0] / 2 - width * mm / 2, A4[1] / 2 - height * mm / 2)
+  draw_cache.append(('path', element, first_pair, len(path_points) // 2, commands))
 
-  if position == 'CR':
-    return (A4[0] - width * mm - padding * mm, A4[1] / 2 - height * mm / 2)
+def handle_path(element: ET.Element):
+  '''
+  Handles a path element by tokenizing it's description in a single
+  compiled-regex pass, pushing every absolute coordinate into the
+  shared point store and keeping per-command metadata for drawing;
+  descriptions outside the expected shape take the generic route
+  '''
+  d = element.attrib['d']
 
-  if position == 'BL':
-    return (padding * mm, A4[1] - height * mm - padding * mm)
+  if slow_path_chars.search(d):
+    handle_path_generic(element, d)
+    return
 
-  if position == 'BC':
-    return (A4[0] / 2 - width * mm / 2, A4[1] - height * mm - padding * mm)
+  first_pair = len(path_points) // 2
+  commands = []
 
-  if position == 'BR':
-    return (A4[0] - width * mm - padding * mm, A4[1] - height * mm - padding * mm)
+  # Hoisted locals, this loop runs once per token in the document
+  push_points = path_points.extend
+  push_command = commands.append
 
-# ///////////////////////// Element Handlers /////////////////////////
+  command = None
+  relative = False
+  params = []
 
-def handle_path(element: ET.Element, bounds_mode: bool, x_off: float, y_off: float) -> tuple[float, float, float, float]:
-  '''
-  Handles a path element by either manipulating every single command
-  within it's description by the axies offsets or by calculating the
-  min and max bounds of all coordinates available
-  '''
-  # MinX, MinY, MaxX, MaxY
-  bounds = [None, None, None, None]
+  # Current position and subpath start, both absolute
+  cur_x = cur_y = 0.0
+  start_x = start_y = 0.0
 
-  # Defines the path to be drawn
-  # A path definition is a list of path commands where each command is
-  # composed of a command letter and numeric parameters
-  d = element.attrib['d']
-  path = parse_path(d)
+  for token in path_token.finditer(d):
+    text = token.group()
 
-  supported_commands = [Line, Move, Close, CubicBezier, Arc]
+    if text.isalpha():
+      upper = text.upper()
 
-  for command in path:
-    if not type(command) in supported_commands:
-      print(f'Encountered unsupported path command {type(command)}')
+      if upper not in command_arity:
+        print(f'Encountered unsupported path command {text}')
+        sys.exit(1)
+
+      command = upper
+      relative = text.islower()
+      params.clear()
+
+      # Closing consumes no parameters and warps back to the start
+      if upper == 'Z':
+        push_command(('Z', None))
+        cur_x, cur_y = start_x, start_y
+
+      continue
+
+    if command is None or command == 'Z':
+      print(f'Encountered stray path parameter {text}')
       sys.exit(1)
 
-    if not bounds_mode:
-      manip_start_end(command, x_off, y_off)
+    # The two arc flags are single 0/1 characters which minified output
+    # glues right onto the following number, so split them off by hand
+    if command == 'A':
+      while text and len(params) in (3, 4):
+        if text[0] not in '01':
+          print(f'Encountered malformed arc flag {text}')
+          sys.exit(1)
+
+        params.append(float(text[0]))
+        text = text[1:]
+
+      if text:
+        params.append(float(text))
+    else:
+      params.append(float(text))
+
+    if len(params) < command_arity[command]:
+      continue
+
+    # A full parameter group is present, emit one command
+    if command == 'M':
+      x, y = params
+      if relative:
+        x += cur_x
+        y += cur_y
+
+      push_command(('M', None))
+      push_points((x, y))
+      cur_x, cur_y = x, y
+      start_x, start_y = x, y
+
+      # Subsequent pairs of a moveto are implicit linetos
+      command = 'L'
+
+    elif command == 'L':
+      x, y = params
+      if relative:
+        x += cur_x
+        y += cur_y
+
+      push_command(('L', None))
+      push_points((x, y))
+      cur_x, cur_y = x, y
+
+    elif command == 'C':
+      x1, y1, x2, y2, x, y = params
+      if relative:
+        x1 += cur_x; y1 += cur_y
+        x2 += cur_x; y2 += cur_y
+        x += cur_x; y += cur_y
+
+      push_command(('C', None))
+      push_points((x1, y1, x2, y2, x, y))
+      cur_x, cur_y = x, y
+
     else:
-      update_bounds(bounds, command.start)
-      update_bounds(bounds, command.end)
+      rx, ry, rotation, large_arc, sweep, x, y = params
+      if relative:
+        x += cur_x
+        y += cur_y
+
+      # An arc between coinciding endpoints is omitted entirely
+      # (spec F.6.6), parameterizing it would degenerate into junk
+      if x == cur_x and y == cur_y:
+        params.clear()
+        continue
+
+      # A zero radius degrades the arc to a plain line (spec F.6.6)
+      if rx == 0 or ry == 0:
+        push_command(('L', None))
+        push_points((x, y))
+        cur_x, cur_y = x, y
+        params.clear()
+        continue
+
+      extra = parameterize_arc(cur_x, cur_y, rx, ry, rotation, large_arc != 0, sweep != 0, x, y)
+      collect_arc_extremes(x + extra[7], y + extra[8], extra)
+
+      push_command(('A', extra))
+      push_points((x, y))
+      cur_x, cur_y = x, y
 
-  if bounds_mode:
-    return bounds
+    params.clear()
 
-  element.attrib['d'] = path.d()
+  draw_cache.append(('path', element, first_pair, len(path_points) // 2, commands))
 
-def handle_circle(element: ET.Element, bounds_mode: bool, x_off: float, y_off: float) -> complex:
+def handle_circle(element: ET.Element):
   '''
-  Handles a circle element by either manipulating it's center point
-  by the axies offsets or by returning that center point
+  Handles a circle element by parsing it's center point once and
+  pushing it into the shared point store
   '''
-  if bounds_mode:
-    return complex(float(element.attrib['cx']), float(element.attrib['cy']))
+  draw_cache.append(('circle', element, len(circle_points) // 2))
+  circle_points.extend((float(element.attrib['cx']), float(element.attrib['cy'])))
 
-  element.attrib['cx'] = str(float(element.attrib['cx']) + x_off)
-  element.attrib['cy'] = str(float(element.attrib['cy']) + y_off)
-
-def walk_group(group: ET.Element, bounds_mode: bool, x_off: float = 0, y_off: float = 0):
+def walk_group(group: ET.Element):
   '''
-  Walk a group of elements recursively and either apply an axies
-  offset or calculate it's min and max bounds
+  Walks a group of elements iteratively with an explicit stack and
+  collects every drawable element into the shared coordinate stores
   '''
-  # MinX, MinY, MaxX, MaxY
-  bounds = [None, None, None, None]
+  # Children are pushed in reverse, so popping yields document order,
+  # which has to be kept intact for the later draw calls
+  stack = deque(reversed(group))
 
-  # Loop all elements of this group
-  for element in group:
+  while stack:
+    element = stack.pop()
+    tag = element.tag
 
-    if element.tag in ignore_tags:
+    # Comments and processing instructions carry no tag name
+    if not isinstance(tag, str):
       continue
 
-    if element.tag in strip_tags:
-      group.remove(element)
+    if tag in ignore_tags:
       continue
 
-    # Dive into the current group recursively
-    if element.tag == 'g':
-      group_bounds = walk_group(element, bounds_mode, x_off, y_off)
+    if tag in strip_tags:
+      element.getparent().remove(element)
+      continue
 
-      if bounds_mode:
-        merge_bounds(bounds, group_bounds)
+    # Dive into the current group by pushing it's children
+    if tag == 'g':
+      stack.extend(reversed(element))
+      continue
 
+    if tag == 'path':
+      handle_path(element)
       continue
 
-    if element.tag == 'path':
-      path_bounds = handle_path(element, bounds_mode, x_off, y_off)
+    if tag == 'circle':
+      handle_circle(element)
+      continue
 
-      if bounds_mode:
-        merge_bounds(bounds, path_bounds)
+    print(f'Encountered unknown element "{tag}!')
+    sys.exit(1)
 
-      continue
+def compute_global_bounds(coords: np.ndarray, centers: np.ndarray, extremes: np.ndarray) -> np.ndarray:
+  '''
+  Computes the global bounds over the contiguous coordinate stores
+  with a single vectorized reduction each
+  '''
+  bounds = make_bounds()
 
-    if element.tag == 'circle':
-      pos = handle_circle(element, bounds_mode, x_off, y_off)
+  if coords.size > 0:
+    merge_bounds(bounds, bounds_kernel(coords))
 
-      if bounds_mode:
-        update_bounds(bounds, pos)
+  if centers.size > 0:
+    merge_bounds(bounds, bounds_kernel(centers))
 
+  if extremes.size > 0:
+    merge_bounds(bounds, bounds_kernel(extremes))
+
+  return bounds
+
+# ///////////////////////// Direct Rendering /////////////////////////
+
+def parse_style_color(value: str):
+  '''
+  Parses a color value into a reportlab color, where none-like values
+  yield None; raises ValueError on anything unparseable
+  '''
+  if value in ('none', 'transparent'):
+    return None
+
+  # toColor misreads shorthand hex like #00f as #00000f, so expand the
+  # digits into pairs up front and refuse other odd lengths entirely
+  if value.startswith('#'):
+    if len(value) in (4, 5):
+      value = '#' + ''.join(digit * 2 for digit in value[1:])
+
+    # The alpha nibbles need spelling out, plain toColor drops them
+    if len(value) == 9:
+      color = colors.HexColor(value, hasAlpha=True)
+
+      # Translucency cannot be reproduced directly, but a fully opaque
+      # alpha obviously renders just the same
+      if color.alpha != 1:
+        raise ValueError(f'Unsupported translucent color {value}')
+
+      return color
+
+    if len(value) != 7:
+      raise ValueError(f'Unsupported hex color {value}')
+
+  return colors.toColor(value)
+
+def effective_style(element: ET.Element) -> dict | None:
+  '''
+  Resolves the effective styling of an element by merging it's inline
+  style declarations and presentation attributes up the ancestor chain,
+  where the nearest definition wins; yields None as soon as any styling
+  outside the supported set shows up
+  '''
+  style = {}
+  node = element
+
+  while node is not None:
+    declarations = []
+
+    # Inline declarations take precedence over presentation attributes
+    inline = node.attrib.get('style')
+    if inline:
+      for declaration in inline.split(';'):
+        declaration = declaration.strip()
+        if declaration:
+          name, _, value = declaration.partition(':')
+          declarations.append((name.strip(), value.strip()))
+
+    for name in supported_styles:
+      if name in node.attrib:
+        declarations.append((name, node.attrib[name]))
+
+    for name in unsupported_styles:
+      if name in node.attrib:
+        return None
+
+    for name, value in declarations:
+      if name not in supported_styles:
+        return None
+
+      # Opacities cannot be reproduced directly, but the default of
+      # fully opaque obviously renders just the same
+      if name.endswith('opacity'):
+        try:
+          if float(value) != 1:
+            return None
+        except ValueError:
+          return None
+        continue
+
+      style.setdefault(name, value)
+
+    node = node.getparent()
+
+  return style
+
+def resolve_draw_params(style: dict) -> tuple | None:
+  '''
+  Converts a resolved style dict into concrete canvas drawing
+  parameters, or None if a value cannot be reproduced directly
+  '''
+  try:
+    stroke_color = parse_style_color(style.get('stroke', 'none'))
+    fill_color = parse_style_color(style.get('fill', '#000000'))
+    stroke_width = float(style.get('stroke-width', '1'))
+  except ValueError:
+    return None
+
+  line_cap = line_caps.get(style.get('stroke-linecap', 'butt'))
+  line_join = line_joins.get(style.get('stroke-linejoin', 'miter'))
+  fill_mode = fill_modes.get(style.get('fill-rule', 'nonzero'))
+
+  if line_cap is None or line_join is None or fill_mode is None:
+    return None
+
+  # A zero-width stroke renders nothing in SVG
+  if stroke_width <= 0:
+    stroke_color = None
+
+  return (stroke_color, fill_color, stroke_width, line_cap, line_join, fill_mode)
+
+def prepare_direct_render(rect_color: str) -> tuple | None:
+  '''
+  Pre-validates that every cached element can be reproduced by the
+  direct renderer and resolves all drawing parameters up front, so that
+  nothing is emitted onto the canvas before a potential fallback to the
+  svglib pipeline; yields (draw_params, rect_stroke), where draw_params
+  runs parallel to the draw cache
+  '''
+  draw_params = []
+  for entry in draw_cache:
+    kind = entry[0]
+    element = entry[1]
+    radius = None
+
+    if kind == 'path':
+      # A rotated arc ellipse cannot be expressed through arcTo
+      for letter, extra in entry[4]:
+        if letter == 'A' and extra[2] != 0:
+          return None
+
+    else:
+      try:
+        radius = float(element.attrib['r'])
+      except (KeyError, ValueError):
+        return None
+
+    style = effective_style(element)
+    params = resolve_draw_params(style) if style is not None else None
+
+    if params is None:
+      return None
+
+    draw_params.append(params if radius is None else (radius, params))
+
+  # The rectangle color takes the same parsing as element styles, so
+  # shorthand hex ends up expanded here as well
+  try:
+    rect_stroke = parse_style_color(rect_color)
+  except ValueError:
+    return None
+
+  if rect_stroke is None:
+    return None
+
+  return (draw_params, rect_stroke)
+
+def apply_draw_params(pdf_canvas: canvas.Canvas, params: tuple) -> tuple[bool, bool, int]:
+  '''
+  Applies concrete drawing parameters to the canvas graphics state and
+  yields the (stroke, fill, fill_mode) flags for the draw call
+  '''
+  stroke_color, fill_color, stroke_width, line_cap, line_join, fill_mode = params
+
+  if stroke_color is not None:
+    pdf_canvas.setStrokeColor(stroke_color)
+    pdf_canvas.setLineWidth(stroke_width)
+    pdf_canvas.setLineCap(line_cap)
+    pdf_canvas.setLineJoin(line_join)
+
+  if fill_color is not None:
+    pdf_canvas.setFillColor(fill_color)
+
+  return (stroke_color is not None, fill_color is not None, fill_mode)
+
+def render_direct(
+  pdf_canvas: canvas.Canvas, coords: np.ndarray, centers: np.ndarray,
+  params: tuple, origin: tuple[float, float], scale: float,
+  uuwidth: float, uuheight: float, do_rotate: bool, rect_width_uu: float
+):
+  '''
+  Streams the cached geometry directly onto the PDF canvas, skipping
+  the XML serialization and the full re-parse through svglib
+  '''
+  draw_params, rect_stroke = params
+
+  pdf_canvas.saveState()
+
+  # Place the drawing's bottom left corner at the page origin and turn
+  # it by 90 degrees if requested, mirroring what the svglib route
+  # does with it's RLG-level transforms
+  pdf_canvas.translate(origin[0], origin[1])
+  if do_rotate:
+    pdf_canvas.translate(uuheight * scale, 0)
+    pdf_canvas.rotate(90)
+
+  # Map SVG user units (y pointing down) onto page points (y up)
+  pdf_canvas.translate(0, uuheight * scale)
+  pdf_canvas.scale(scale, -scale)
+
+  # Walk the cache in document order, so stacked elements overdraw each
+  # other exactly like they would in the SVG
+  for entry, element_params in zip(draw_cache, draw_params):
+    if entry[0] == 'circle':
+      radius, element_params = element_params
+      stroke, fill, _ = apply_draw_params(pdf_canvas, element_params)
+      cx, cy = centers[entry[2]]
+      pdf_canvas.circle(cx, cy, radius, stroke=stroke, fill=fill)
       continue
 
-    print(f'Encountered unknown element "{element.tag}!')
-    sys.exit(1)
+    _, _, first_pair, last_pair, commands = entry
+    stroke, fill, fill_mode = apply_draw_params(pdf_canvas, element_params)
 
-  return bounds
+    path = pdf_canvas.beginPath()
+    pairs = coords[first_pair:last_pair]
+    index = 0
+
+    for letter, extra in commands:
+      if letter == 'M':
+        path.moveTo(*pairs[index])
+        index += 1
+
+      elif letter == 'L':
+        path.lineTo(*pairs[index])
+        index += 1
+
+      elif letter == 'C':
+        (x1, y1), (x2, y2), (x, y) = pairs[index:index + 3]
+        index += 3
+        path.curveTo(x1, y1, x2, y2, x, y)
+
+      elif letter == 'A':
+        rx, ry, _, _, _, theta, delta, rel_cx, rel_cy = extra
+        (x, y) = pairs[index]
+        index += 1
+
+        # The center travels with the endpoint it's stored relative to
+        cx = x + rel_cx
+        cy = y + rel_cy
+        path.arcTo(cx - rx, cy - ry, cx + rx, cy + ry, theta, delta)
+
+      else:
+        path.close()
+
+    pdf_canvas.drawPath(path, stroke=stroke, fill=fill, fillMode=fill_mode)
+
+  # The enclosing rectangle matches the one appended to the XML tree
+  if rect_width_uu > 0:
+    pdf_canvas.setStrokeColor(rect_stroke)
+    pdf_canvas.setLineWidth(rect_width_uu)
+    pdf_canvas.setLineCap(0)
+    pdf_canvas.setLineJoin(0)
+    pdf_canvas.rect(
+      rect_width_uu / 2, rect_width_uu / 2,
+      uuwidth - rect_width_uu, uuheight - rect_width_uu,
+      stroke=1, fill=0
+    )
+
+  pdf_canvas.restoreState()
 
 # /////////////////////////// Entry Point ///////////////////////////
 
@@ -273,36 +845,41 @@ def main():
   if rect_width_mm == 0:
     rect_padding_mm = 0
 
-  tree = ET.parse(input_path)
-  root = tree.getroot()
-
-  # Iterate through all XML elements
-  for elem in root.iter():
-    # Remove a namespace URI in the element's name
+  # Strip the namespace URIs off the element names right while parsing,
+  # which saves a dedicated pass over the whole tree afterwards
+  context = ET.iterparse(input_path, events=('end',))
+  for _, elem in context:
     elem.tag = normalize_tag(elem.tag)
 
-  # Loop all elements once in order to check the global bounds
-  global_bounds = [None, None, None, None]
+  root = context.root
+  tree = root.getroottree()
+
+  # Loop all elements once in order to collect every drawable into the
+  # coordinate stores and the serialization caches
   for child in root:
     if child.tag == 'g':
-      merge_bounds(global_bounds, walk_group(child, True))
+      walk_group(child)
 
-  scaling_info = analyze_scaling(root)
-  mm_per_uu = scaling_info[2]
+  # Materialize the flat stores into contiguous (N, 2) arrays
+  coords = np.fromiter(path_points, dtype=np.float64).reshape(-1, 2)
+  centers = np.fromiter(circle_points, dtype=np.float64).reshape(-1, 2)
+  extremes = np.fromiter(bounds_points, dtype=np.float64).reshape(-1, 2)
 
-  x_off = -global_bounds[0] + (1 / mm_per_uu) * (rect_width_mm + rect_padding_mm)
-  y_off = -global_bounds[1] + (1 / mm_per_uu) * (rect_width_mm + rect_padding_mm)
+  # Back to plain floats, all further math is scalar anyways
+  min_x, min_y, max_x, max_y = map(float, compute_global_bounds(coords, centers, extremes))
 
-  # Loop all elements again to now apply the movement
-  for child in root:
-    if child.tag != 'g':
-      continue
+  mm_per_uu = analyze_scaling(root)
+
+  x_off = -min_x + (1 / mm_per_uu) * (rect_width_mm + rect_padding_mm)
+  y_off = -min_y + (1 / mm_per_uu) * (rect_width_mm + rect_padding_mm)
 
-    walk_group(child, False, x_off, y_off)
+  # The direct renderer works off the shifted coordinate stores
+  coords += (x_off, y_off)
+  centers += (x_off, y_off)
 
   # Calculate the width and height of the svg's content in user units
-  uuwidth = global_bounds[2] - global_bounds[0]
-  uuheight = global_bounds[3] - global_bounds[1]
+  uuwidth = max_x - min_x
+  uuheight = max_y - min_y
 
   uuwidth += (1 / mm_per_uu) * (rect_padding_mm * 2 + rect_width_mm * 2)
   uuheight += (1 / mm_per_uu) * (rect_padding_mm * 2 + rect_width_mm * 2)
@@ -332,23 +909,11 @@ def main():
   rect_container.append(rect_elem)
   root.append(rect_container)
 
-  temp_svg = os.path.join(temp_folder, 'layout_postproc.svg')
-
-  # Write the modified XML into an output SVG file
-  tree.write(temp_svg)
-
-  # Read the temporary SVG into a reportlab compatible graphic
-  svg_rlg = svg2rlg(temp_svg)
-
   out_path = os.path.join(os.path.dirname(input_path), 'layout_postproc.pdf')
 
   # Auto-rotate if it's height could be narrower
-  do_rotate = svg_rlg.height > svg_rlg.width
+  do_rotate = mmheight > mmwidth
   if do_rotate:
-    # Origin seems to be left center... shift back after rotating
-    svg_rlg.translate(svg_rlg.height, 0)
-    svg_rlg.rotate(90)
-
     # Swap height and width
     buf = mmheight
     mmheight = mmwidth
@@ -356,12 +921,56 @@ def main():
 
   xy_pos = decide_svg_xy(mmwidth, mmheight, page_padding_mm, position)
 
-  # Create a new blank A4 canvas at the output location and draw the temporary svg on it
-  pdf_canvas = canvas.Canvas(out_path, pagesize=A4)
+  # Create a new blank A4 canvas at the output location
+  pdf_canvas = canvas.Canvas(out_path, pagesize=A4, pageCompression=1)
 
   # Sometimes the PCB is too close to the top, this issue is still unresolved...
   # Let's just add 3mm to make sure the printer doesn't cut it off.
-  renderPDF.draw(svg_rlg, pdf_canvas, xy_pos[0], A4[1] - xy_pos[1] - mmheight * mm - 3 * mm)
+  origin = (xy_pos[0], A4[1] - xy_pos[1] - mmheight * mm - 3 * mm)
+
+  # Stream the cached geometry straight onto the canvas whenever it can
+  # be reproduced faithfully, which skips the whole temporary SVG
+  # serialize/re-parse detour through svglib
+  direct_params = prepare_direct_render(rect_color)
+
+  if direct_params is not None:
+    render_direct(
+      pdf_canvas, coords, centers, direct_params, origin,
+      mm_per_uu * mm, uuwidth, uuheight, do_rotate, rect_width_uu
+    )
+
+  else:
+    # Express the movement as a single transform on every top level group
+    # instead of rewriting each coordinate string; svglib applies it while
+    # rendering. This only happens here so that transforms already present
+    # in the document reliably route away from the direct renderer above
+    translate = f'translate({x_off:.6g} {y_off:.6g})'
+    for child in root:
+      # The rectangle container is already placed in shifted coordinates
+      if child.tag == 'g' and child is not rect_container:
+        existing = child.get('transform')
+        child.set('transform', f'{translate} {existing}' if existing else translate)
+
+    # Serialize the modified XML into an in-memory buffer and read it
+    # back into a reportlab compatible graphic, sparing the disk trip
+    buffer = io.BytesIO()
+    tree.write(buffer)
+    buffer.seek(0)
+
+    svg_rlg = svg2rlg(buffer)
+
+    # Rotate on the canvas state directly instead of pushing another
+    # transform pass through the RLG scene graph
+    pdf_canvas.saveState()
+    pdf_canvas.translate(origin[0], origin[1])
+
+    if do_rotate:
+      # Origin seems to be left center... shift back after rotating
+      pdf_canvas.translate(svg_rlg.height, 0)
+      pdf_canvas.rotate(90)
+
+    renderPDF.draw(svg_rlg, pdf_canvas, 0, 0)
+    pdf_canvas.restoreState()
 
   pdf_canvas.save()
 